@@ -65,6 +65,13 @@ class Catch( object ):
         self.enemy_speed_y      = random.choice( [ y for y in range( -2,2 ) if y not in [ -1, 0, 1 ] ] )
         self.speed_multiplier   = 1
 
+        # Closed-form landing data, one entry per falling object.
+        # Objects fall straight down, so landing x is fixed at drop
+        # and the frame they reach PLAYER_Y only changes with speed.
+        self.frame_count        = 0
+        self.landing_x          = []
+        self.impact_frames      = []
+
         self.falling_objects    = []
         self.object_speed       = 5
         self.max_num_objects    = MAX_PROJECTILES
@@ -81,6 +88,20 @@ class Catch( object ):
         self.screen  = pygame.display.set_mode( ( SCREEN_WIDTH, SCREEN_HEIGHT ) )
         pygame.display.set_caption( "Catch the Objects!" )
 
+    #---------------------------------------------------------
+    # PROPERTIES
+    #---------------------------------------------------------
+    @property
+    def object_speed( self ):
+        return ( self._object_speed )
+
+
+    @object_speed.setter
+    def object_speed( self, speed ):
+        # Re-solve the impact frame of objects already in flight
+        self._object_speed = speed
+        self.impact_frames = [ self.frame_count + ( PLAYER_Y - obj.y ) / speed for obj in self.falling_objects ]
+
     #---------------------------------------------------------
     # PROCEDURES
     #---------------------------------------------------------
@@ -147,6 +168,11 @@ class Catch( object ):
             game_exit()
     
 
+    def time_to_impact( self ):
+        # Frames until each falling object's top edge reaches PLAYER_Y
+        return ( [ impact - self.frame_count for impact in self.impact_frames ] )
+
+
     def draw( self ):
         # Drawing
         self.draw_player()
@@ -159,6 +185,7 @@ class Catch( object ):
     def update( self, action=None ):
         # Set the temporary collision flag to false
         self.temp_collision_det = False
+        self.frame_count       += 1
         # Player movement and ESC key for exiting the game
         self.get_key_press( action )
 
@@ -177,8 +204,12 @@ class Catch( object ):
         if self.frames_since_last_drop >= self.drop_cooldown:
             if random.randint( 1, 75 ) == 1:
                 if len( self.falling_objects ) < self.max_num_objects:
-                    self.falling_objects.append( pygame.Rect( self.enemy_x + ENEMY_WIDTH // 2, self.enemy_y + ENEMY_HEIGHT, OBJECT_WIDTH, OBJECT_HEIGHT ) )
+                    obj = pygame.Rect( self.enemy_x + ENEMY_WIDTH // 2, self.enemy_y + ENEMY_HEIGHT, OBJECT_WIDTH, OBJECT_HEIGHT )
+                    self.falling_objects.append( obj )
                     self.frames_since_last_drop = 0
+                    # The new object also moves this frame, hence the - 1
+                    self.landing_x.append( obj.x )
+                    self.impact_frames.append( self.frame_count - 1 + ( PLAYER_Y - obj.y ) / self.object_speed )
 
         # Update falling objects
         for obj in self.falling_objects[ : ]:
@@ -190,7 +221,10 @@ class Catch( object ):
                     print(f"Game Over! Score: { self.score }")
                 self.running = False
             if self.check_collision( pygame.Rect( self.player_x, PLAYER_Y, PLAYER_WIDTH, PLAYER_HEIGHT ), obj ):
-                self.falling_objects.remove( obj )
+                index = self.falling_objects.index( obj )
+                del self.falling_objects[ index ]
+                del self.landing_x[ index ]
+                del self.impact_frames[ index ]
                 self.score += 1
                 continue
 
@@ -207,6 +241,9 @@ class Catch( object ):
         self.collision_detected = False
         self.temp_collision_det = False
         self.falling_objects.clear()
+        self.frame_count        = 0
+        self.landing_x.clear()
+        self.impact_frames.clear()
 
 
     def run_game( self, action=None ):
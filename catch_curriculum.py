@@ -0,0 +1,197 @@
+#---------------------------------------------------------
+# IMPORTS
+#---------------------------------------------------------
+import os
+import json
+import numpy as np
+
+from collections                        import deque
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+#---------------------------------------------------------
+# CONSTANTS
+#---------------------------------------------------------
+# Difficulty levels, easiest first. Each level is passed
+# straight through to CatchEnv.set_difficulty.
+DEFAULT_LEVELS = [
+                 { "object_speed" : 3, "max_num_objects" : 1,  "drop_cooldown" : 60 },
+                 { "object_speed" : 4, "max_num_objects" : 3,  "drop_cooldown" : 40 },
+                 { "object_speed" : 5, "max_num_objects" : 5,  "drop_cooldown" : 30 },
+                 { "object_speed" : 5, "max_num_objects" : 10, "drop_cooldown" : 20 },
+                 { "object_speed" : 6, "max_num_objects" : 10, "drop_cooldown" : 15 },
+                 { "object_speed" : 7, "max_num_objects" : 10, "drop_cooldown" : 10 },
+                 ]
+
+# Rolling window of finished episodes used to judge a group
+SCORE_WINDOW  = 20
+PROMOTE_SCORE = 10
+
+#---------------------------------------------------------
+# CLASSES
+#---------------------------------------------------------
+class CurriculumCallback( BaseCallback ):
+    """ Adaptive difficulty scheduler for live environments.
+
+    Watches the final score of every finished episode and
+    keeps a rolling window per group of environments. When a
+    group's average score reaches promote_score it moves up a
+    level (or down a level below demote_score) and the new
+    settings are pushed to that group's workers in place with
+    env_method, between two rollout steps. Workers are never
+    rebuilt or restarted.
+
+    Groups default to one group per environment. Pass
+    groups=[ list( range( NUM_ENVS ) ) ] to move all
+    environments together. start_level is one level for every
+    group or a list with one level per group.
+
+    Levels and score windows are written to state_path whenever
+    a level changes and when training ends. Pass a previous run's
+    file as resume_path to pick up where it left off.
+    """
+
+    def __init__( self, levels=DEFAULT_LEVELS, groups=None, window=SCORE_WINDOW,
+                  promote_score=PROMOTE_SCORE, demote_score=None, start_level=0,
+                  state_path=None, resume_path=None, verbose=0 ):
+        super( CurriculumCallback, self ).__init__( verbose )
+        self.levels        = list( levels )
+        self.groups        = groups
+        self.window        = window
+        self.promote_score = promote_score
+        self.demote_score  = demote_score
+        self.start_level   = start_level
+        self.state_path    = state_path
+        self.resume_path   = resume_path
+
+        # Filled in once the training environment is known
+        self.group_of_env  = {}
+        self.group_levels  = []
+        self.group_scores  = []
+
+
+    def state_dict( self ):
+        """ Snapshot of the curriculum's progress.
+
+        Args:
+            argument_1 (CurriculumCallback): Reference to self.
+
+        Returns:
+            dict: groups, level and rolling scores of every group.
+        """
+        return ( {
+                 "groups"       : self.groups,
+                 "group_levels" : list( self.group_levels ),
+                 "group_scores" : [ [ float( score ) for score in scores ] for scores in self.group_scores ],
+                 } )
+
+
+    def load_state_dict( self, state ):
+        """ Restore progress saved by state_dict().
+
+        Args:
+            argument_1 (CurriculumCallback): Reference to self.
+            argument_2 (dict): Saved curriculum state.
+        """
+        if self.groups is not None and [ list( group ) for group in self.groups ] != state[ "groups" ]:
+            raise ValueError( f"Saved curriculum groups { state[ 'groups' ] } don't match { self.groups }" )
+
+        self.groups       = state[ "groups" ]
+        self.group_of_env = { env_idx : group_idx
+                              for group_idx, group in enumerate( self.groups )
+                              for env_idx in group }
+        self.group_levels = [ min( level, len( self.levels ) - 1 ) for level in state[ "group_levels" ] ]
+        self.group_scores = [ deque( scores, maxlen=self.window ) for scores in state[ "group_scores" ] ]
+
+
+    def _save_state( self ):
+        if self.state_path is None:
+            return
+
+        # Swap the file in so a crash never leaves it half written
+        state_tmp = self.state_path + ".tmp"
+        with open( state_tmp, "w" ) as f:
+            json.dump( self.state_dict(), f, indent=2 )
+        os.replace( state_tmp, self.state_path )
+
+
+    def _on_training_start( self ):
+        num_envs = self.training_env.num_envs
+
+        if self.resume_path is not None:
+            with open( self.resume_path ) as f:
+                self.load_state_dict( json.load( f ) )
+        else:
+            # One group per environment unless told otherwise
+            if self.groups is None:
+                self.groups = [ [ i ] for i in range( num_envs ) ]
+
+            start_levels = self.start_level
+            if isinstance( start_levels, int ):
+                start_levels = [ start_levels ] * len( self.groups )
+
+            self.load_state_dict( {
+                                  "groups"       : [ list( group ) for group in self.groups ],
+                                  "group_levels" : list( start_levels ),
+                                  "group_scores" : [ [] for _ in self.groups ],
+                                  } )
+
+        # Apply the starting level to every group
+        for group_idx in range( len( self.groups ) ):
+            self._apply_level( group_idx )
+
+
+    def _apply_level( self, group_idx ):
+        """ Push a group's current level to its live workers.
+
+        Args:
+            argument_1 (CurriculumCallback): Reference to self.
+            argument_2 (int): Index of the group to update.
+        """
+        level    = self.group_levels[ group_idx ]
+        settings = self.levels[ level ]
+        self.training_env.env_method( "set_difficulty", indices=self.groups[ group_idx ], **settings )
+
+        if self.verbose > 0:
+            print( f"Curriculum: group { group_idx } -> level { level } { settings }" )
+
+
+    def _on_step( self ) -> bool:
+        dones = self.locals[ "dones" ]
+        infos = self.locals[ "infos" ]
+
+        for env_idx, done in enumerate( dones ):
+            if not done or env_idx not in self.group_of_env:
+                continue
+
+            group_idx = self.group_of_env[ env_idx ]
+            scores    = self.group_scores[ group_idx ]
+            scores.append( infos[ env_idx ].get( "score", 0 ) )
+
+            # Only judge a group once its window is full
+            if len( scores ) < self.window:
+                continue
+
+            level      = self.group_levels[ group_idx ]
+            mean_score = float( np.mean( scores ) )
+            if mean_score >= self.promote_score and level < len( self.levels ) - 1:
+                level += 1
+            elif self.demote_score is not None and mean_score < self.demote_score and level > 0:
+                level -= 1
+            else:
+                continue
+
+            # Start a fresh window at the new level
+            self.group_levels[ group_idx ] = level
+            scores.clear()
+            self._apply_level( group_idx )
+            self._save_state()
+
+        for group_idx, level in enumerate( self.group_levels ):
+            self.logger.record( f"curriculum/level_group_{ group_idx }", level )
+
+        return ( True )
+
+
+    def _on_training_end( self ):
+        self._save_state()
@@ -31,17 +31,50 @@ MAX_PROJECTILES = 10
 MAX_SPEED       = 5
 PIXEL_BUFFER    = 7
 
+# Named terms that make up the shaped reward
+REWARD_COMPONENTS = ( "alignment", "proactive", "movement", "catch" )
+
+#---------------------------------------------------------
+# PROCEDURES
+#---------------------------------------------------------
+def closest_landing( landing, mask ):
+    """ Find the next object to land that is still above the player.
+
+    Works on a single observation or on a batch from a VecEnv,
+    since only the last two axes are used.
+
+    Args:
+        argument_1 (np.ndarray): Landing features, ( ..., MAX_PROJECTILES, 2 )
+                                 holding ( landing x, time to impact ).
+        argument_2 (np.ndarray): Active projectile mask, ( ..., MAX_PROJECTILES ).
+
+    Returns:
+        tuple: ( index, found ) arrays, one entry per observation.
+    """
+    time_to_impact = np.where( ( mask == 1 ) & ( landing[ ..., 1 ] > 0 ), landing[ ..., 1 ], np.inf )
+    index          = np.argmin( time_to_impact, axis=-1 )
+    found          = np.isfinite( np.min( time_to_impact, axis=-1 ) )
+    return ( index, found )
+
 #---------------------------------------------------------
 # CLASSES
 #---------------------------------------------------------
 class CatchEnv( Env ):
  
-    def __init__( self, game ):
+    def __init__( self, game, store=None, landing_features=False ):
         super().__init__()
 
         # Game instance to apply Environment on
         self.game = game
 
+        # Optional trajectory sink (see catch_store.TrajectoryWriter)
+        self.store    = store
+        self.last_obs = None
+
+        # Per slot ( landing x, time to impact ), optionally observed
+        self.landing_features = landing_features
+        self.landing          = np.zeros( ( MAX_PROJECTILES, 2 ) )
+
         # Initialize the step state and reward
         self.done           = False
         self.reward_val     = 0
@@ -54,7 +87,9 @@ class CatchEnv( Env ):
                          "episode_num"          : self.episode_num,
                          "object_speed"         : self.game.object_speed,
                          "object_count"         : self.game.max_num_objects,
+                         "drop_cooldown"        : self.game.drop_cooldown,
                          "score"                : self.game.score,
+                         "reward_components"    : dict.fromkeys( REWARD_COMPONENTS, 0.0 ),
                          "terminal_observation" : {}
                          }
 
@@ -88,6 +123,14 @@ class CatchEnv( Env ):
             }
         )
 
+        # Where and in how many frames each projectile reaches PLAYER_Y
+        if self.landing_features:
+            self.observation_space[ "landing" ] = spaces.Box(    #    Landing x range                  Time to impact range (frames)
+                                                            low  = np.array( [ [ 0,                               -( SCREEN_HEIGHT - PLAYER_Y ) ] ] * MAX_PROJECTILES ),
+                                                            high = np.array( [ [ ( SCREEN_WIDTH - OBJECT_WIDTH ), PLAYER_Y                      ] ] * MAX_PROJECTILES ),
+                                                            dtype= float,
+                                                            )
+
 
     def reset( self, seed=None ):
         """ Reset to the episode instance.
@@ -113,16 +156,63 @@ class CatchEnv( Env ):
         self.reward_val     = 0
         self.last_player_x  = ( SCREEN_WIDTH // 2 ) - ( PLAYER_WIDTH // 2 )
 
+        # Close off an episode the trajectory sink saw cut short
+        if self.store is not None:
+            self.store.end_episode( truncated=True )
+
         # Reset relevant Catch attributes
         self.game.restart()
 
         # Increment episode based settings
         self.episode_num += 1
         self.info_logs[ "episode_num" ] = self.episode_num
+        self.info_logs[ "reward_components" ] = dict.fromkeys( REWARD_COMPONENTS, 0.0 )
 
-        return ( self._get_obs(), self._get_info() )
+        # Remember the starting state for the trajectory sink
+        self.last_obs = self._get_obs()
+
+        return ( self.last_obs, self._get_info() )
     
 
+    def set_difficulty( self, object_speed=None, max_num_objects=None, drop_cooldown=None ):
+        """ Reconfigure the game's difficulty in place.
+
+        Intended to be called on live workers through
+        VecEnv.env_method so a curriculum can change the
+        difficulty without rebuilding or restarting the
+        environment. Settings left as None are unchanged and
+        objects already on screen keep falling.
+
+        Args:
+            argument_1 (CatchEnv): Reference to self, CatchEnv.
+            argument_2 (int): New falling speed of the objects.
+            argument_3 (int): Max objects on screen, capped at
+                              MAX_PROJECTILES (observation size).
+            argument_4 (int): Frames between object drops.
+
+        Returns:
+            dict: returns the difficulty now in effect.
+        """
+        # pygame Rects hold integer coordinates, so keep settings integral
+        if object_speed is not None:
+            self.game.object_speed = max( 1, int( object_speed ) )
+        if max_num_objects is not None:
+            self.game.max_num_objects = min( max( 1, int( max_num_objects ) ), MAX_PROJECTILES )
+        if drop_cooldown is not None:
+            self.game.drop_cooldown = max( 1, int( drop_cooldown ) )
+
+        # Keep the logged difficulty in sync with the game
+        self.info_logs[ "object_speed" ]  = self.game.object_speed
+        self.info_logs[ "object_count" ]  = self.game.max_num_objects
+        self.info_logs[ "drop_cooldown" ] = self.game.drop_cooldown
+
+        return ( {
+                 "object_speed"    : self.game.object_speed,
+                 "max_num_objects" : self.game.max_num_objects,
+                 "drop_cooldown"   : self.game.drop_cooldown,
+                 } )
+
+
     def _get_info( self ):
         """ Private getter for extra relevant game info.
 
@@ -137,7 +227,30 @@ class CatchEnv( Env ):
                          score, episode count, object count, object speed,
                          and average score.
         """
-        return ( self.info_logs )
+        # Hand out a copy so a VecEnv auto-reset can't overwrite
+        # the info (e.g. reward_components) of the final step
+        return ( dict( self.info_logs ) )
+
+
+    def _get_landing( self ):
+        """ Private getter for the landing features.
+
+        Reads the game's incrementally maintained landing x and
+        impact frame of each falling object, so nothing is searched
+        or sorted here. Inactive slots are padded with (0, 0).
+
+        Args:
+            argument_1 (CatchEnv): Reference to self, CatchEnv.
+
+        Returns:
+            np.ndarray: ( MAX_PROJECTILES, 2 ) array of
+                        ( landing x, time to impact ).
+        """
+        landing = np.zeros( ( MAX_PROJECTILES, 2 ) )
+        count   = min( len( self.game.falling_objects ), MAX_PROJECTILES )
+        landing[ : count, 0 ] = self.game.landing_x[ : count ]
+        landing[ : count, 1 ] = self.game.time_to_impact()[ : count ]
+        return ( landing )
     
 
     def _get_obs( self ):
@@ -189,6 +302,11 @@ class CatchEnv( Env ):
                       "mask"       : np.array( mask ),
                       }
 
+        # Landing features are always kept for the reward
+        self.landing = self._get_landing()
+        if self.landing_features:
+            observation[ "landing" ] = self.landing
+
         return ( observation )
 
 
@@ -217,73 +335,80 @@ class CatchEnv( Env ):
         info      = self._get_info()
         truncated = False
 
+        # Record the transition from the pre-action observation
+        if self.store is not None:
+            self.store.append( self.last_obs, action, self.reward_val, self.done, info[ "reward_components" ] )
+        self.last_obs = observation
+
         return ( observation, self.reward_val, self.done, truncated, info )
 
 
     def reward( self, obs ):
-        # Base reward initialization
-        reward = 0
+        # Base reward initialization, broken down by term for logging
+        reward     = 0
+        components = dict.fromkeys( REWARD_COMPONENTS, 0.0 )
+        self.info_logs[ "reward_components" ] = components
 
         # Calculate player's center position
         # Grab the x position of the player
         player_x = obs[ "player" ][ 0 ] # Index 0 because that correspond 
                                         # to the X coordinate
         player_center_x = player_x + ( PLAYER_WIDTH // 2 )
-        player_center_y = PLAYER_Y - ( PLAYER_HEIGHT // 2 )
-
-        # Loop through falling objects to find the closest one
-        active_projectiles = []
-
-        # Grab array indicies of the active projectiles
-        for index, mask in enumerate( obs[ "mask" ] ):
-            if mask:
-                active_projectiles.append( index )
-
-        coord_pairs_of_actv_proj = []
-        for index in active_projectiles:
-            coord_pairs_of_actv_proj.append( obs[ "projectiles" ][ index ] )
 
         # If there are no falling objects return a reward of 0
-        if not coord_pairs_of_actv_proj:
+        if not np.any( obs[ "mask" ] ):
             return reward
-        # Else sort by the second element of each sublist
-        else: coord_pairs_of_actv_proj.sort( reverse=True, key=lambda x: x[ 1 ] )
 
-        # Grab the closest object that isn't aleady below the player
-        closest_obj = ( 0, 0 )
-        for index, pair in enumerate( coord_pairs_of_actv_proj ):
+        # Use the observation's own landing features when it has them,
+        # else the ones kept alongside the latest observation
+        landing = obs[ "landing" ] if "landing" in obs else self.landing
 
-            # Make sure the object is already below the player
-            if( PLAYER_Y > pair[ 1 ] ):
-                closest_obj = pair
-                break
-            else: continue
+        # Grab the next object to land that isn't already below the
+        # player, i.e. the smallest positive time to impact
+        index, found = closest_landing( landing, obs[ "mask" ] )
+        closest_x    = landing[ index, 0 ] if found else 0
 
         # Calculate the center of the falling object
-        obj_center_x = closest_obj[ 0 ] + ( OBJECT_WIDTH // 2 )
-        obj_center_y = closest_obj[ 1 ] - ( OBJECT_HEIGHT // 2 )
+        obj_center_x = closest_x + ( OBJECT_WIDTH // 2 )
 
-        # Compute separate x and y distances
+        # Compute the x distance
         x_distance = abs( player_center_x - obj_center_x ) / SCREEN_WIDTH
-        # y_distance = abs( player_center_y - obj_center_y ) / SCREEN_HEIGHT
 
         # Shaping reward: prioritize X alignment
-        reward += 1.0 - x_distance  # closer is better
+        components[ "alignment" ] = 1.0 - x_distance  # closer is better
 
-        # Bonus if proactively standing under an object (before it reaches player Y)
-        if abs( player_center_x - obj_center_x ) < OBJECT_WIDTH and obj_center_y < PLAYER_Y:
-            reward += 0.3  # proactive bonus
+        # Bonus if proactively standing under an object (closest_landing only
+        # returns objects that have not reached player Y yet)
+        if abs( player_center_x - obj_center_x ) < OBJECT_WIDTH:
+            components[ "proactive" ] = 0.3  # proactive bonus
 
         # Penalize excessive movement (efficiency)
         movement_penalty = abs(player_x - self.last_player_x) / SCREEN_WIDTH
-        reward -= 0.5 * movement_penalty
+        components[ "movement" ] = -0.5 * movement_penalty
 
         if self.game.temp_collision_det == True:
-            reward                       = 10               # Full reward for catching the object
+            components.update( dict.fromkeys( REWARD_COMPONENTS, 0.0 ) )
+            components[ "catch" ]        = 10               # Full reward for catching the object
             self.game.temp_collision_det = False            # Reset the collision flag
-            return ( reward )                               # Return immediately if an object is caught
+            return ( components[ "catch" ] )                # Return immediately if an object is caught
+
+        reward += components[ "alignment" ] + components[ "proactive" ] + components[ "movement" ]
 
         # Save last player position for next step
         self.last_player_x = player_x
 
         return ( reward )
+
+
+    def close( self ):
+        """ Release the environment's resources.
+
+        Flushes and closes the trajectory sink, if any, so its
+        index is on disk once the env (or its VecEnv worker) shuts
+        down.
+
+        Args:
+            argument_1 (CatchEnv): Reference to self, CatchEnv.
+        """
+        if self.store is not None:
+            self.store.close()
@@ -13,7 +13,9 @@ from stable_baselines3.common.callbacks import CheckpointCallback
 from stable_baselines3.common.vec_env   import SubprocVecEnv
 from stable_baselines3.common.monitor   import Monitor
 
+from catch_curriculum                   import CurriculumCallback
 from catch_env                          import CatchEnv
+from catch_store                        import VecTrajectoryRecorder
 from catch                              import Catch
 
 
@@ -28,6 +30,15 @@ TIMESTEPS = 10000000
 SAVE_FREQ = 500000
 VERSION   = "V16_RPPO_TEST"
 
+# Adapt object speed/count/drop cooldown to performance during training
+USE_CURRICULUM      = False
+
+# Previous run's curriculum.json to resume the curriculum from (or None)
+CURRICULUM_RESUME   = None
+
+# Record every transition to disk for offline analysis/replay
+RECORD_TRAJECTORIES = False
+
 #---------------------------------------------------------
 # CLASSES
 #---------------------------------------------------------
@@ -45,6 +56,7 @@ class InfoLoggerCallback( BaseCallback ):
             # Log everything returned from get_info()
             self.logger.record(" custom/object_speed", info[ "object_speed" ] )
             self.logger.record(" custom/object_count", info[ "object_count" ] )
+            self.logger.record(" custom/drop_cooldown", info[ "drop_cooldown" ] )
             self.logger.record(" custom/episode_num",  info[ "episode_num" ] )
 
             # Track highest individual score ever seen
@@ -84,7 +96,16 @@ checkpoint_callback = CheckpointCallback(
 info_logger = InfoLoggerCallback()
 
 # Combine callbacks
-callbacks = CallbackList( [ checkpoint_callback, info_logger ] )
+callbacks = [ checkpoint_callback, info_logger ]
+
+# Optionally add the adaptive difficulty scheduler
+if USE_CURRICULUM:
+    callbacks.append( CurriculumCallback(
+                                        state_path=os.path.join( models_dir, "curriculum.json" ),
+                                        resume_path=CURRICULUM_RESUME,
+                                        ) )
+
+callbacks = CallbackList( callbacks )
 
 #---------------------------------------------------------
 # PROCEDURES
@@ -115,6 +136,11 @@ if __name__ == "__main__":
     envs = [ env for env in envs if env is not None ]  # Filter out failed envs
     env  = SubprocVecEnv( envs )
 
+    # Optionally stream all transitions into a memory-mapped store
+    if RECORD_TRAJECTORIES:
+        trajectory_dir = os.path.join( "trajectories", VERSION, str( int( time.time() ) ) )
+        env            = VecTrajectoryRecorder( env, trajectory_dir )
+
     # # Resume training of previous model version
     # prev_model = PPO.load( "models/V15_FULL_SEND/1745153387/catch_ppo_agent_V15_FULL_SEND_10000000_steps.zip", env=env, device="auto" )
 
@@ -147,4 +173,7 @@ if __name__ == "__main__":
 
     # Save model after training is complete
     model.save( f"{ models_dir }/{ TIMESTEPS }" )
+
+    # Flush any recorded trajectories and shut down the workers
+    env.close()
         
\ No newline at end of file
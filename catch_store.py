@@ -0,0 +1,446 @@
+#---------------------------------------------------------
+# IMPORTS
+#---------------------------------------------------------
+import os
+import json
+import numpy as np
+
+from collections                      import OrderedDict
+
+from stable_baselines3.common.vec_env import VecEnvWrapper
+
+from catch_env                        import REWARD_COMPONENTS
+
+
+#---------------------------------------------------------
+# CONSTANTS
+#---------------------------------------------------------
+# Rows preallocated per chunk file
+CHUNK_SIZE    = 1_000_000
+
+# Rows between index/metadata flushes
+FLUSH_EVERY   = 10_000
+
+# Chunks a reader keeps memory-mapped at once (one fd per column each)
+MAX_OPEN_CHUNKS = 16
+
+META_FILE     = "meta.json"
+EPISODES_FILE = "episodes.bin"
+
+#---------------------------------------------------------
+# PROCEDURES
+#---------------------------------------------------------
+def _field_specs( observation_space ):
+    """ Build the (shape, dtype) of every stored column.
+
+    Observation keys are stored as "obs_<key>". Float
+    observations are stored as float32 to halve the disk
+    footprint; pixel coordinates are exact at that precision.
+
+    Args:
+        argument_1 (spaces.Dict): Observation space of the env.
+
+    Returns:
+        dict: column name -> ( shape, dtype string ).
+    """
+    specs = {}
+    for key, space in observation_space.spaces.items():
+        dtype = np.float32 if np.issubdtype( space.dtype, np.floating ) else space.dtype
+        specs[ f"obs_{ key }" ] = ( tuple( space.shape ), np.dtype( dtype ).str )
+
+    specs[ "action" ]            = ( (),                           np.dtype( np.int64 ).str )
+    specs[ "reward" ]            = ( (),                           np.dtype( np.float32 ).str )
+    specs[ "done" ]              = ( (),                           np.dtype( np.bool_ ).str )
+    specs[ "truncated" ]         = ( (),                           np.dtype( np.bool_ ).str )
+    specs[ "reward_components" ] = ( ( len( REWARD_COMPONENTS ), ), np.dtype( np.float32 ).str )
+    return ( specs )
+
+
+def _chunk_dir( path, chunk_idx ):
+    return ( os.path.join( path, f"chunk_{ chunk_idx:05d}" ) )
+
+#---------------------------------------------------------
+# CLASSES
+#---------------------------------------------------------
+class TrajectoryWriter( object ):
+    """ Append-only transition sink backed by memory-mapped files.
+
+    Every column lives in chunk_XXXXX/<column>.npy files that are
+    preallocated to chunk_size rows, so appending never copies
+    earlier data. episodes.bin is an append-only list of int64
+    ( start_row, length ) pairs, one per finished episode, and
+    meta.json holds the number of valid rows. Every flush_every
+    rows, on chunk rollover and on close(), new episodes are
+    appended and meta.json is swapped in last as the commit marker,
+    so a reader can open the store while it is still being written
+    and sees every row up to the last flush. A crash loses at most
+    flush_every rows of index.
+
+    Pass an instance as CatchEnv( game, store=writer ), or use
+    VecTrajectoryRecorder to record every sub-environment.
+    """
+
+    def __init__( self, path, observation_space, chunk_size=CHUNK_SIZE, flush_every=FLUSH_EVERY ):
+        os.makedirs( path, exist_ok=True )
+
+        self.path          = path
+        self.chunk_size    = chunk_size
+        self.flush_every   = flush_every
+        self.specs         = _field_specs( observation_space )
+        self.length        = 0
+        self.episode_start = 0
+        self.episodes      = []     # Finished episodes not yet flushed
+        self.columns       = None
+
+        # Start a fresh episode index
+        open( os.path.join( self.path, EPISODES_FILE ), "wb" ).close()
+
+
+    def _open_chunk( self, chunk_idx ):
+        """ Preallocate the memory-mapped columns of a new chunk.
+
+        Args:
+            argument_1 (TrajectoryWriter): Reference to self.
+            argument_2 (int): Index of the chunk to create.
+        """
+        chunk_path = _chunk_dir( self.path, chunk_idx )
+        os.makedirs( chunk_path, exist_ok=True )
+
+        self.columns = {}
+        for name, ( shape, dtype ) in self.specs.items():
+            self.columns[ name ] = np.lib.format.open_memmap(
+                                                            os.path.join( chunk_path, f"{ name }.npy" ),
+                                                            mode  = "w+",
+                                                            dtype = np.dtype( dtype ),
+                                                            shape = ( self.chunk_size, ) + shape,
+                                                            )
+
+
+    def append( self, obs, action, reward, done, components, truncated=False ):
+        """ Store one transition.
+
+        Args:
+            argument_1 (TrajectoryWriter): Reference to self.
+            argument_2 (dict): Observation the action was taken from.
+            argument_3 (int): Action taken.
+            argument_4 (float): Reward received.
+            argument_5 (bool): Whether the episode ended.
+            argument_6 (dict): Reward broken down by REWARD_COMPONENTS.
+            argument_7 (bool): Whether the episode was cut short.
+        """
+        row = self.length % self.chunk_size
+
+        # Roll over to a fresh chunk when the current one is full
+        if row == 0:
+            if self.columns is not None:
+                self.flush()
+            self._open_chunk( self.length // self.chunk_size )
+
+        for key, value in obs.items():
+            self.columns[ f"obs_{ key }" ][ row ] = value
+        self.columns[ "action" ][ row ]            = action
+        self.columns[ "reward" ][ row ]            = reward
+        self.columns[ "done" ][ row ]              = done
+        self.columns[ "truncated" ][ row ]         = truncated
+        self.columns[ "reward_components" ][ row ] = [ components.get( name, 0.0 ) for name in REWARD_COMPONENTS ]
+
+        self.length += 1
+
+        # Close off the episode index entry
+        if done:
+            self.episodes.append( ( self.episode_start, self.length - self.episode_start ) )
+            self.episode_start = self.length
+
+        # Keep the on-disk index reasonably current for live readers
+        if self.length % self.flush_every == 0:
+            self.flush()
+
+
+    def end_episode( self, truncated=True ):
+        """ Close the open episode without a done step.
+
+        Called when the env is reset mid-episode. The last stored row
+        is flagged in the truncated column so its next row (the reset
+        state) is not mistaken for a bootstrap target. Does nothing if
+        no steps were stored since the last episode ended.
+
+        Args:
+            argument_1 (TrajectoryWriter): Reference to self.
+            argument_2 (bool): Flag the last row as truncated.
+        """
+        if self.episode_start == self.length:
+            return
+
+        # The last row always lives in the open chunk
+        self.columns[ "truncated" ][ ( self.length - 1 ) % self.chunk_size ] = truncated
+        self.episodes.append( ( self.episode_start, self.length - self.episode_start ) )
+        self.episode_start = self.length
+
+
+    def flush( self ):
+        """ Flush written rows and the index to disk.
+
+        Args:
+            argument_1 (TrajectoryWriter): Reference to self.
+        """
+        if self.columns is not None:
+            for column in self.columns.values():
+                column.flush()
+
+        # Append only the episodes finished since the last flush.
+        # meta.json goes last since its length is what marks rows
+        # (and so episodes) as valid.
+        if self.episodes:
+            with open( os.path.join( self.path, EPISODES_FILE ), "ab" ) as f:
+                f.write( np.array( self.episodes, dtype=np.int64 ).tobytes() )
+            self.episodes = []
+
+        meta = {
+               "length"     : self.length,
+               "chunk_size" : self.chunk_size,
+               "fields"     : { name : [ list( shape ), dtype ] for name, ( shape, dtype ) in self.specs.items() },
+               "components" : list( REWARD_COMPONENTS ),
+               }
+        meta_tmp = os.path.join( self.path, META_FILE + ".tmp" )
+        with open( meta_tmp, "w" ) as f:
+            json.dump( meta, f, indent=2 )
+        os.replace( meta_tmp, os.path.join( self.path, META_FILE ) )
+
+
+    def close( self ):
+        """ Flush and release the open chunk.
+
+        Steps of an unfinished episode stay in the store but are
+        not listed in the episode index.
+
+        Args:
+            argument_1 (TrajectoryWriter): Reference to self.
+        """
+        self.flush()
+        self.columns = None
+
+
+class TrajectoryReader( object ):
+    """ Streams random mini-batches from one or more stores.
+
+    path may point at a single TrajectoryWriter store or at a
+    directory of them (as written by VecTrajectoryRecorder).
+    Chunks are memory-mapped read-only on first use and at most
+    max_open_chunks stay open (least recently used are dropped),
+    so only the rows a batch touches are paged in and the number
+    of open files stays bounded however large the stores grow.
+    """
+
+    def __init__( self, path, max_open_chunks=MAX_OPEN_CHUNKS ):
+        self.path            = path
+        self.max_open_chunks = max_open_chunks
+        self.open_chunks     = OrderedDict()
+
+        if os.path.exists( os.path.join( path, META_FILE ) ):
+            store_paths = [ path ]
+        else:
+            store_paths = sorted( os.path.join( path, name ) for name in os.listdir( path )
+                                  if os.path.exists( os.path.join( path, name, META_FILE ) ) )
+
+        self.stores = []
+        self.fields = []
+        fields      = None
+        for store_path in store_paths:
+            with open( os.path.join( store_path, META_FILE ) ) as f:
+                meta = json.load( f )
+
+            # Every store must share one layout to be sampled together
+            if fields is None:
+                fields = meta[ "fields" ]
+            elif meta[ "fields" ] != fields:
+                raise ValueError( f"Store '{ store_path }' has different fields than '{ store_paths[ 0 ] }'" )
+
+            # Drop a trailing partial pair and any episodes a live
+            # writer indexed past the length read above
+            episodes_path = os.path.join( store_path, EPISODES_FILE )
+            episodes      = np.fromfile( episodes_path, dtype=np.int64, count=( os.path.getsize( episodes_path ) // 16 ) * 2 )
+            episodes      = episodes.reshape( -1, 2 )
+            episodes      = episodes[ episodes.sum( axis=1 ) <= meta[ "length" ] ]
+
+            self.stores.append( {
+                                "path"       : store_path,
+                                "length"     : meta[ "length" ],
+                                "chunk_size" : meta[ "chunk_size" ],
+                                "episodes"   : episodes,
+                                } )
+
+        if fields is not None:
+            self.fields = list( fields )
+
+        # Each row except a store's last has a following row to use as
+        # next observation, so only those are sampled.
+        usable      = [ max( store[ "length" ] - 1, 0 ) for store in self.stores ]
+        self.bounds = np.cumsum( [ 0 ] + usable )
+
+
+    def __len__( self ):
+        return ( int( self.bounds[ -1 ] ) )
+
+
+    def episodes( self ):
+        """ Episode boundaries of every store.
+
+        Returns:
+            list: one ( num_episodes, 2 ) array of ( start_row, length )
+                  pairs per store.
+        """
+        return ( [ store[ "episodes" ] for store in self.stores ] )
+
+
+    def _chunk( self, store_idx, chunk_idx ):
+        """ Memory-map one chunk's columns, reusing recently opened ones.
+
+        Args:
+            argument_1 (TrajectoryReader): Reference to self.
+            argument_2 (int): Index of the store.
+            argument_3 (int): Index of the chunk within the store.
+
+        Returns:
+            dict: column name -> read-only memmap.
+        """
+        key = ( store_idx, chunk_idx )
+        if key in self.open_chunks:
+            self.open_chunks.move_to_end( key )
+            return ( self.open_chunks[ key ] )
+
+        chunk_path = _chunk_dir( self.stores[ store_idx ][ "path" ], chunk_idx )
+        columns    = { name : np.load( os.path.join( chunk_path, f"{ name }.npy" ), mmap_mode="r" )
+                       for name in self.fields }
+
+        # Dropping the last reference unmaps the file and frees its fd
+        self.open_chunks[ key ] = columns
+        if len( self.open_chunks ) > self.max_open_chunks:
+            self.open_chunks.popitem( last=False )
+        return ( columns )
+
+
+    def _gather( self, store_idx, name, rows ):
+        """ Read sorted rows of one column across chunk files.
+
+        Args:
+            argument_1 (TrajectoryReader): Reference to self.
+            argument_2 (int): Index of the store to read from.
+            argument_3 (str): Column name.
+            argument_4 (np.ndarray): Sorted row indices.
+
+        Returns:
+            np.ndarray: the requested rows.
+        """
+        chunk_size = self.stores[ store_idx ][ "chunk_size" ]
+        chunk_ids  = rows // chunk_size
+        offsets    = rows %  chunk_size
+        parts      = []
+        for chunk_idx in np.unique( chunk_ids ):
+            column = self._chunk( store_idx, int( chunk_idx ) )[ name ]
+            parts.append( column[ offsets[ chunk_ids == chunk_idx ] ] )
+        return ( np.concatenate( parts ) )
+
+
+    def sample( self, batch_size, rng=None ):
+        """ Draw a uniform random mini-batch of transitions.
+
+        Each batch holds every stored column plus "next_obs_<key>"
+        taken from the following row. For rows with done or truncated
+        set that row is the next episode's first state, so it must be
+        masked out when bootstrapping.
+
+        Args:
+            argument_1 (TrajectoryReader): Reference to self.
+            argument_2 (int): Number of transitions.
+            argument_3 (np.random.Generator): Optional RNG.
+
+        Returns:
+            dict: column name -> ( batch_size, ... ) array.
+        """
+        if len( self ) == 0:
+            raise ValueError( f"No transitions to sample in '{ self.path }' (empty or missing store)" )
+
+        rng     = np.random.default_rng() if rng is None else rng
+        indices = np.sort( rng.integers( 0, len( self ), size=batch_size ) )
+        owners  = np.searchsorted( self.bounds, indices, side="right" ) - 1
+
+        batch = { name : [] for name in self.fields }
+        batch.update( { f"next_{ name }" : [] for name in self.fields if name.startswith( "obs_" ) } )
+        for store_idx in np.unique( owners ):
+            rows = indices[ owners == store_idx ] - self.bounds[ store_idx ]
+            for name in self.fields:
+                batch[ name ].append( self._gather( store_idx, name, rows ) )
+                if name.startswith( "obs_" ):
+                    batch[ f"next_{ name }" ].append( self._gather( store_idx, name, rows + 1 ) )
+
+        return ( { name : np.concatenate( parts ) for name, parts in batch.items() } )
+
+
+    def iter_batches( self, batch_size, num_batches=None, seed=None ):
+        """ Yield random mini-batches, forever unless num_batches is set.
+
+        Args:
+            argument_1 (TrajectoryReader): Reference to self.
+            argument_2 (int): Number of transitions per batch.
+            argument_3 (int): Number of batches to yield.
+            argument_4 (int): Seed for the RNG.
+        """
+        rng   = np.random.default_rng( seed )
+        count = 0
+        while num_batches is None or count < num_batches:
+            yield self.sample( batch_size, rng=rng )
+            count += 1
+
+
+class VecTrajectoryRecorder( VecEnvWrapper ):
+    """ Records every sub-environment of a VecEnv.
+
+    Each sub-environment gets its own TrajectoryWriter under
+    path/env_XXX, so episodes stay contiguous within a store.
+    Auto-reset observations returned on done become the first
+    state of the next recorded episode. A reset() mid-episode
+    closes the open episodes as truncated.
+    """
+
+    def __init__( self, venv, path, chunk_size=CHUNK_SIZE ):
+        super().__init__( venv )
+
+        self.writers  = [ TrajectoryWriter( os.path.join( path, f"env_{ i:03d}" ), venv.observation_space, chunk_size )
+                          for i in range( venv.num_envs ) ]
+        self.last_obs = None
+        self.actions  = None
+
+
+    def reset( self ):
+        for writer in self.writers:
+            writer.end_episode( truncated=True )
+        self.last_obs = self.venv.reset()
+        return ( self.last_obs )
+
+
+    def step_async( self, actions ):
+        self.actions = actions
+        self.venv.step_async( actions )
+
+
+    def step_wait( self ):
+        obs, rewards, dones, infos = self.venv.step_wait()
+
+        for i, writer in enumerate( self.writers ):
+            writer.append(
+                         { key : value[ i ] for key, value in self.last_obs.items() },
+                         self.actions[ i ],
+                         rewards[ i ],
+                         dones[ i ],
+                         infos[ i ].get( "reward_components", {} ),
+                         infos[ i ].get( "TimeLimit.truncated", False ),
+                         )
+
+        self.last_obs = obs
+        return ( obs, rewards, dones, infos )
+
+
+    def close( self ):
+        for writer in self.writers:
+            writer.close()
+        self.venv.close()
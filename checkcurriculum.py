@@ -0,0 +1,159 @@
+import os
+os.environ.setdefault( "SDL_VIDEODRIVER", "dummy" )
+
+import math
+import shutil
+import random
+import tempfile
+
+from catch            import Catch
+from catch_env        import CatchEnv, MAX_PROJECTILES, PLAYER_Y
+from catch_curriculum import CurriculumCallback
+
+LEVELS = [
+         { "object_speed" : 2, "max_num_objects" : 1,  "drop_cooldown" : 50 },
+         { "object_speed" : 4, "max_num_objects" : 5,  "drop_cooldown" : 30 },
+         { "object_speed" : 6, "max_num_objects" : 10, "drop_cooldown" : 10 },
+         ]
+
+#---------------------------------------------------------
+# STUBS
+#---------------------------------------------------------
+class StubVecEnv( object ):
+    # Just enough of a VecEnv for the curriculum: env_method on indices
+    def __init__( self, envs ):
+        self.envs     = envs
+        self.num_envs = len( envs )
+
+    def env_method( self, method_name, *args, indices=None, **kwargs ):
+        indices = range( self.num_envs ) if indices is None else indices
+        return ( [ getattr( self.envs[ i ], method_name )( *args, **kwargs ) for i in indices ] )
+
+
+class StubLogger( object ):
+    def record( self, key, value ):
+        pass
+
+
+class StubModel( object ):
+    def __init__( self, env ):
+        self.env           = env
+        self.logger        = StubLogger()
+        self.num_timesteps = 0
+
+    def get_env( self ):
+        return ( self.env )
+
+#---------------------------------------------------------
+# PROCEDURES
+#---------------------------------------------------------
+def settings( env ):
+    return ( { "object_speed"    : env.game.object_speed,
+               "max_num_objects" : env.game.max_num_objects,
+               "drop_cooldown"   : env.game.drop_cooldown } )
+
+
+def start( venv, **kwargs ):
+    callback = CurriculumCallback( levels=LEVELS, **kwargs )
+    callback.init_callback( StubModel( venv ) )
+    callback.on_training_start( {}, {} )
+    return ( callback )
+
+
+def finish_episodes( callback, venv, scores ):
+    # One step where the given envs end an episode with these scores
+    dones = [ env_idx in scores for env_idx in range( venv.num_envs ) ]
+    infos = [ { "score" : scores.get( env_idx, 0 ) } for env_idx in range( venv.num_envs ) ]
+    callback.update_locals( { "dones" : dones, "infos" : infos } )
+    callback.on_step()
+
+#---------------------------------------------------------
+# EXECUTION
+#---------------------------------------------------------
+random.seed( 0 )
+envs = [ CatchEnv( Catch() ) for _ in range( 3 ) ]
+for env in envs:
+    env.reset()
+
+# set_difficulty: clamping and info_logs sync
+env = envs[ 0 ]
+assert env.set_difficulty( object_speed=6.7, max_num_objects=50, drop_cooldown=0 ) == \
+       { "object_speed" : 6, "max_num_objects" : MAX_PROJECTILES, "drop_cooldown" : 1 }
+assert env.set_difficulty( object_speed=-3, max_num_objects=0 ) == \
+       { "object_speed" : 1, "max_num_objects" : 1, "drop_cooldown" : 1 }
+assert env.set_difficulty() == settings( env )
+info = env._get_info()
+assert ( info[ "object_speed" ], info[ "object_count" ], info[ "drop_cooldown" ] ) == ( 1, 1, 1 )
+
+# set_difficulty: objects already in flight are re-solved
+env.set_difficulty( object_speed=5, max_num_objects=MAX_PROJECTILES )
+while len( env.game.falling_objects ) < 2:
+    env.game.update()
+env.set_difficulty( object_speed=3 )
+for _ in range( 5 ):
+    env.game.update()
+for tti, obj in zip( env.game.time_to_impact(), env.game.falling_objects ):
+    assert math.isclose( tti, ( PLAYER_Y - obj.y ) / 3, abs_tol=1e-9 )
+
+# Curriculum: envs 0 and 1 move together, env 2 on its own
+venv     = StubVecEnv( envs )
+callback = start( venv, groups=[ [ 0, 1 ], [ 2 ] ], window=3, promote_score=10, demote_score=2 )
+assert all( settings( env ) == LEVELS[ 0 ] for env in envs )
+
+# No decision until the window is full
+finish_episodes( callback, venv, { 0 : 12, 1 : 12 } )
+assert callback.group_levels == [ 0, 0 ]
+
+# Full window of high scores promotes only that group
+finish_episodes( callback, venv, { 0 : 12, 2 : 0 } )
+assert callback.group_levels == [ 1, 0 ]
+assert settings( envs[ 0 ] ) == settings( envs[ 1 ] ) == LEVELS[ 1 ]
+assert settings( envs[ 2 ] ) == LEVELS[ 0 ]
+
+# The window restarts after a level change
+finish_episodes( callback, venv, { 0 : 12, 1 : 12 } )
+assert callback.group_levels == [ 1, 0 ]
+
+# Low scores can't demote below level 0
+finish_episodes( callback, venv, { 2 : 0 } )
+finish_episodes( callback, venv, { 2 : 0 } )
+assert callback.group_levels == [ 1, 0 ]
+
+# Low scores demote, high scores stop at the last level
+for _ in range( 3 ):
+    finish_episodes( callback, venv, { 0 : 0 } )
+assert callback.group_levels == [ 0, 0 ]
+assert settings( envs[ 0 ] ) == LEVELS[ 0 ]
+for _ in range( 4 * 3 ):
+    finish_episodes( callback, venv, { 2 : 20 } )
+assert callback.group_levels == [ 0, 2 ]
+assert settings( envs[ 2 ] ) == LEVELS[ 2 ]
+
+# Per-group start levels
+callback = start( venv, groups=[ [ 0, 1 ], [ 2 ] ], start_level=[ 2, 1 ] )
+assert settings( envs[ 0 ] ) == LEVELS[ 2 ] and settings( envs[ 2 ] ) == LEVELS[ 1 ]
+
+# Saved state resumes levels and score windows
+root = tempfile.mkdtemp()
+try:
+    state_path = os.path.join( root, "curriculum.json" )
+    callback   = start( venv, window=3, promote_score=10, state_path=state_path )
+    for _ in range( 3 ):
+        finish_episodes( callback, venv, { 0 : 15, 1 : 4 } )
+    callback.on_training_end()
+    assert callback.group_levels == [ 1, 0, 0 ]
+
+    for env in envs:
+        env.set_difficulty( **LEVELS[ 0 ] )
+    resumed = start( venv, window=3, promote_score=10, resume_path=state_path )
+    assert resumed.state_dict() == callback.state_dict()
+    assert settings( envs[ 0 ] ) == LEVELS[ 1 ]
+
+    # Env 1's restored window is full, so two good episodes promote it
+    finish_episodes( resumed, venv, { 1 : 20 } )
+    finish_episodes( resumed, venv, { 1 : 20 } )
+    assert resumed.group_levels == [ 1, 1, 0 ]
+finally:
+    shutil.rmtree( root )
+
+print( "Curriculum OK" )
@@ -0,0 +1,102 @@
+import os
+os.environ.setdefault( "SDL_VIDEODRIVER", "dummy" )
+
+import math
+import random
+
+from catch     import Catch
+from catch_env import CatchEnv, SCREEN_WIDTH, PLAYER_WIDTH, PLAYER_Y, OBJECT_WIDTH, OBJECT_HEIGHT
+
+NUM_FRAMES   = 20000
+SPEED_EVERY  = 150
+SPEEDS       = [ 2, 3, 5, 7 ]
+
+def baseline_reward( obs, last_player_x, caught ):
+    # The sort-based CatchEnv.reward this repo shipped before the
+    # landing features, kept here as the reference
+    reward          = 0
+    player_x        = obs[ "player" ][ 0 ]
+    player_center_x = player_x + ( PLAYER_WIDTH // 2 )
+
+    active = [ obs[ "projectiles" ][ i ] for i, mask in enumerate( obs[ "mask" ] ) if mask ]
+    if not active:
+        return reward
+    active.sort( reverse=True, key=lambda x: x[ 1 ] )
+
+    closest_obj = ( 0, 0 )
+    for pair in active:
+        if( PLAYER_Y > pair[ 1 ] ):
+            closest_obj = pair
+            break
+
+    obj_center_x = closest_obj[ 0 ] + ( OBJECT_WIDTH // 2 )
+    obj_center_y = closest_obj[ 1 ] - ( OBJECT_HEIGHT // 2 )
+
+    reward += 1.0 - abs( player_center_x - obj_center_x ) / SCREEN_WIDTH
+    if abs( player_center_x - obj_center_x ) < OBJECT_WIDTH and obj_center_y < PLAYER_Y:
+        reward += 0.3
+    reward -= 0.5 * abs( player_x - last_player_x ) / SCREEN_WIDTH
+
+    if caught:
+        return ( 10 )
+    return ( reward )
+
+
+def check_landing( game ):
+    # Cached landing data must match the closed form from the live rects
+    assert len( game.landing_x ) == len( game.impact_frames ) == len( game.falling_objects )
+    for i, obj in enumerate( game.falling_objects ):
+        assert game.landing_x[ i ] == obj.x
+        assert math.isclose( game.time_to_impact()[ i ], ( PLAYER_Y - obj.y ) / game.object_speed, abs_tol=1e-9 ), \
+            ( i, game.time_to_impact()[ i ], obj.y, game.object_speed )
+
+
+random.seed( 0 )
+game = Catch()
+env  = CatchEnv( game, landing_features=True )
+env.reset( seed=0 )
+game.drop_cooldown = 5
+
+catches        = 0
+speed_changes  = 0
+rewards_chkd   = 0
+for frame in range( NUM_FRAMES ):
+    # Chase the next object to land, with some random moves mixed in
+    ahead = [ ( tti, x ) for tti, x in zip( game.time_to_impact(), game.landing_x ) if tti > 0 ]
+    if ahead and random.random() < 0.8:
+        target = min( ahead )[ 1 ] + OBJECT_WIDTH // 2 - PLAYER_WIDTH // 2
+        action = 1 if target < game.player_x else 2
+    else:
+        action = random.randrange( 3 )
+
+    score = game.score
+    game.update( action )
+    catches += game.score - score
+    check_landing( game )
+
+    # Change speed with objects in flight, directly on the attribute
+    if frame % SPEED_EVERY == 0 and game.falling_objects:
+        game.object_speed = random.choice( SPEEDS )
+        speed_changes    += 1
+        check_landing( game )
+
+    # Compare against the baseline on the same observation, with and
+    # without the landing channel in it
+    obs    = env._get_obs()
+    last_x = env.last_player_x
+    caught = game.temp_collision_det
+    if frame % 2:
+        del obs[ "landing" ]
+    expected = baseline_reward( obs, last_x, caught )
+    actual   = env.reward( obs )
+    assert math.isclose( actual, expected, abs_tol=1e-9 ), ( frame, actual, expected )
+    rewards_chkd += 1
+
+    # Game over once an object passes the player
+    if not game.running:
+        env.reset()
+        check_landing( game )
+
+assert catches > 0 and speed_changes > 0
+print( f"Landing features OK: { NUM_FRAMES } frames, { catches } catches, "
+       f"{ speed_changes } speed changes, { rewards_chkd } rewards matched" )
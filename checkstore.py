@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from gymnasium   import spaces
+from catch_store import TrajectoryWriter, TrajectoryReader
+
+# Small chunks/flushes so every boundary is crossed a few times
+NUM_STEPS   = 30
+EPISODE_LEN = 10
+CHUNK_SIZE  = 7
+FLUSH_EVERY = 5
+
+# Steps of an episode cut short by a reset, then of an unfinished one
+TRUNC_LEN   = 3
+OPEN_LEN    = 2
+TOTAL_STEPS = NUM_STEPS + TRUNC_LEN + OPEN_LEN
+
+OBS_SPACE = spaces.Dict(
+    {
+        "player" : spaces.Box( low=0, high=1000, shape=( 2, ), dtype=float ),
+        "mask"   : spaces.Box( low=0, high=1, shape=( 3, ), dtype=np.int64 ),
+    }
+)
+
+def write_steps( writers, first, last, episode_len=None ):
+    for t in range( first, last ):
+        done       = episode_len is not None and ( t + 1 ) % episode_len == 0
+        components = { "alignment" : 0.5 * t, "movement" : -0.25 }
+        for i, writer in enumerate( writers ):
+            # Encode step and env in the observation so rows can be traced
+            obs = { "player" : [ t, i ], "mask" : [ 1, 0, 1 ] }
+            writer.append( obs, t % 3, 0.5 * t - 0.25, done, components )
+
+root = tempfile.mkdtemp()
+try:
+    # Two stores laid out the way VecTrajectoryRecorder writes them
+    writers = [ TrajectoryWriter( os.path.join( root, f"env_{ i:03d}" ), OBS_SPACE, CHUNK_SIZE, FLUSH_EVERY )
+                for i in range( 2 ) ]
+
+    # An empty store must fail clearly rather than inside numpy
+    try:
+        TrajectoryReader( root ).sample( 4 )
+        raise AssertionError( "sampling an empty store should raise" )
+    except ValueError as e:
+        print( f"Empty store: { e }" )
+
+    # A live reader sees everything up to the last periodic flush
+    write_steps( writers, 0, 2 * FLUSH_EVERY, EPISODE_LEN )
+    live = TrajectoryReader( root )
+    assert len( live ) == 2 * ( 2 * FLUSH_EVERY - 1 )
+    assert all( episodes.tolist() == [ [ 0, EPISODE_LEN ] ] for episodes in live.episodes() )
+
+    write_steps( writers, 2 * FLUSH_EVERY, NUM_STEPS, EPISODE_LEN )
+
+    # Reset mid-episode, then leave one episode unfinished
+    write_steps( writers, NUM_STEPS, NUM_STEPS + TRUNC_LEN )
+    for writer in writers:
+        writer.end_episode( truncated=True )
+        writer.end_episode( truncated=True )    # No open episode, no-op
+    write_steps( writers, NUM_STEPS + TRUNC_LEN, TOTAL_STEPS )
+
+    for writer in writers:
+        writer.close()
+
+    # Few open chunks so they get evicted and reopened while sampling
+    reader = TrajectoryReader( root, max_open_chunks=2 )
+    assert len( reader ) == 2 * ( TOTAL_STEPS - 1 )
+
+    # Episode boundaries, appended across several flushes
+    expected = [ [ start, EPISODE_LEN ] for start in range( 0, NUM_STEPS, EPISODE_LEN ) ] + [ [ NUM_STEPS, TRUNC_LEN ] ]
+    for episodes in reader.episodes():
+        assert episodes.tolist() == expected, episodes
+
+    # Random batches: next_obs is the following row, also across chunks
+    batch = reader.sample( 4000, rng=np.random.default_rng( 0 ) )
+    steps = batch[ "obs_player" ][ :, 0 ]
+    envs  = batch[ "obs_player" ][ :, 1 ]
+    assert ( batch[ "next_obs_player" ][ :, 0 ] == steps + 1 ).all()
+    assert ( batch[ "next_obs_player" ][ :, 1 ] == envs ).all()
+    assert ( ( steps + 1 ) % CHUNK_SIZE == 0 ).any(), "no chunk-crossing transition sampled"
+
+    # Every sampleable row of every store comes back
+    for i in range( 2 ):
+        assert set( steps[ envs == i ].astype( int ) ) == set( range( TOTAL_STEPS - 1 ) )
+
+    # Stored columns line up with each other
+    assert ( batch[ "reward" ] == 0.5 * steps - 0.25 ).all()
+    assert ( batch[ "action" ] == steps % 3 ).all()
+    assert ( batch[ "done" ] == ( ( steps < NUM_STEPS ) & ( ( steps + 1 ) % EPISODE_LEN == 0 ) ) ).all()
+    assert ( batch[ "truncated" ] == ( steps == NUM_STEPS + TRUNC_LEN - 1 ) ).all()
+    assert np.allclose( batch[ "reward_components" ].sum( axis=1 ), batch[ "reward" ] )
+    assert ( batch[ "obs_mask" ] == [ 1, 0, 1 ] ).all()
+
+    # Stores with different layouts can't be read together
+    mixed_space = spaces.Dict( dict( OBS_SPACE.spaces, landing=spaces.Box( low=0, high=1, shape=( 3, 2 ) ) ) )
+    for i, space in enumerate( [ OBS_SPACE, mixed_space ] ):
+        writer = TrajectoryWriter( os.path.join( root, "mixed", f"env_{ i:03d}" ), space, CHUNK_SIZE, FLUSH_EVERY )
+        writer.close()
+    try:
+        TrajectoryReader( os.path.join( root, "mixed" ) )
+        raise AssertionError( "mixing store layouts should raise" )
+    except ValueError as e:
+        print( f"Mixed stores: { e }" )
+
+    print( f"Round trip OK: { len( reader ) } transitions in { len( reader.episodes() ) } stores" )
+finally:
+    shutil.rmtree( root )